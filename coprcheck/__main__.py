@@ -14,6 +14,12 @@ Options:
 Phases options:
     --no-download       Do not download the package, use existing contents of TARGET
     --no-checks         Do not run checks on the TARGET
+    --resume            Continue interrupted run, skipping work finished in it
+
+Report options:
+    -s, --summary       Print only failure counts instead of the full report
+    -l, --limit=LIMIT   Print at most LIMIT diagnostics [default: unlimited]
+    --top=TOP           Number of packages listed in the summary [default: 10]
 """
 
 
@@ -23,9 +29,11 @@ import docopt
 import yaml
 from tqdm import tqdm
 
+from . _utils.generic import atomic_write
 from . _utils.output import *
 from . apiscan import current_builds
 from . fetch import fetch_build
+from . journal import Journal
 from . checks import rpmgrill
 
 
@@ -44,6 +52,20 @@ def valid_copr_project(name: str) -> (str, str):
         return tuple(parts)
 
 
+def valid_count(name: str, value: str) -> int:
+    """Validate count option value, as non-negative integer.
+
+    Raises:
+        ValueError if the value is not valid.
+    """
+
+    if not value.isdigit():
+        msg = 'Invalid {}: {}'.format(name, value)
+        raise ValueError(msg)
+    else:
+        return int(value)
+
+
 params = docopt.docopt(__doc__.format(prog=__package__))
 
 # Validate project
@@ -58,35 +80,57 @@ if params['--target'] is None:
 if params['--report'] is None:
     params['--report'] = ''.join((user, '-', project, '.yml'))
 
-if not params['--no-download']:
-    builds = list(current_builds(user, project))
-
-    if not params['--quiet']:
-        builds = tqdm(builds)
-
-    for url in builds:
-        fetch_build(url, params['--target'])
-
-if not params['--no-checks']:
-    full_results = dict()
-
-    try:
-        with running_task('rpmgrill'):
-            result = rpmgrill.scan(params['--target'])
-            for pkg, checks in result.items():
-                pkg = full_results.setdefault(pkg, dict())
-                checks = {
-                    check: [': '.join(it) for it in state.items()]
-                    for check, state in checks.items()
-                }
-
-                pkg['rpmgrill'] = checks
-    finally:
-        pass
-
-    if not params['--quiet']:
-        report_failed(full_results)
+# Validate report options
+try:
+    if params['--limit'] == 'unlimited':
+        params['--limit'] = None
+    else:
+        params['--limit'] = valid_count('limit', params['--limit'])
+    params['--top'] = valid_count('top', params['--top'])
+except ValueError as err:
+    raise SystemExit(str(err)) from None
 
-    # print report
-    with open(params['--report'], 'w') as report:
-        print(yaml.dump(full_results, default_flow_style=False), file=report)
+# Nothing to do; do not touch the TARGET nor its journal
+if params['--no-download'] and params['--no-checks']:
+    raise SystemExit(0)
+
+# Checks-only run keeps the records of (possibly unfinished) downloads
+keep_journal = params['--resume'] or params['--no-download']
+
+with Journal(params['--target'], resume=keep_journal,
+             reuse_results=params['--resume']) as journal:
+    if not params['--no-download']:
+        builds = [b for b in current_builds(user, project)
+                  if not journal.is_fetched(b)]
+
+        if not params['--quiet']:
+            builds = tqdm(builds)
+
+        for url in builds:
+            fetch_build(url, params['--target'])
+            journal.record_fetched(url)
+
+    if not params['--no-checks']:
+        full_results = dict()
+
+        try:
+            with running_task('rpmgrill'):
+                result = rpmgrill.scan(params['--target'], journal=journal)
+                for pkg, checks in result.items():
+                    pkg = full_results.setdefault(pkg, dict())
+                    checks = {
+                        check: [': '.join(it) for it in state.items()]
+                        for check, state in checks.items()
+                    }
+
+                    pkg['rpmgrill'] = checks
+        finally:
+            pass
+
+        if not params['--quiet']:
+            report_failed(full_results, summary=params['--summary'],
+                          limit=params['--limit'], top=params['--top'])
+
+        # print report
+        with atomic_write(params['--report']) as report:
+            print(yaml.dump(full_results, default_flow_style=False), file=report)
@@ -2,7 +2,9 @@
 
 
 from collections import namedtuple
+import os
 import re
+from urllib.parse import urlparse
 
 
 class Chroot(namedtuple('Chroot', ['distro', 'version', 'arch'])):
@@ -29,9 +31,16 @@ class Chroot(namedtuple('Chroot', ['distro', 'version', 'arch'])):
         return '-'.join([self.distro, self.version, self.arch])
 
 
-BuildResult = namedtuple('BuildResult', ['build_id', 'chroot', 'url'])
-BuildResult.__doc__ += ': Container for COPR build result info.'
-# For 3.5+
-#BuildResult.build_id.__doc__ = 'Build id.'
-#BuildResult.chroot.__doc__ = 'Chroot in which the build was made.'
-#BuildResult.url.__doc__ = 'Absolute URL of the resulting artifacts.'
+class BuildResult(namedtuple('BuildResult', ['build_id', 'chroot', 'url'])):
+    """Container for COPR build result info."""
+    # For 3.5+
+    #BuildResult.build_id.__doc__ = 'Build id.'
+    #BuildResult.chroot.__doc__ = 'Chroot in which the build was made.'
+    #BuildResult.url.__doc__ = 'Absolute URL of the resulting artifacts.'
+
+    @property
+    def directory(self):
+        """Local directory of the artifacts, relative to project root."""
+
+        name = os.path.basename(urlparse(self.url).path.rstrip('/'))
+        return os.path.join(self.chroot.distribution, name)
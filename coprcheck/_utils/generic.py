@@ -3,11 +3,13 @@ whole module.
 """
 
 
+from contextlib import contextmanager
 from distutils.spawn import find_executable
 from functools import wraps
 import fnmatch
 import itertools as it
 import os
+import tempfile
 
 
 class MissingBinaryError(OSError):
@@ -53,8 +55,62 @@ def rpm_dirs(root: str):
 
     Yields:
         Paths from root (included) to the directory with RPM(s).
+        Hidden directories (i.e. unfinished downloads) are skipped.
     """
 
-    for root, _, flist in os.walk(root):
+    for root, dlist, flist in os.walk(root):
+        dlist[:] = [d for d in dlist if not d.startswith('.')]
         if len(fnmatch.filter(flist, '*.rpm')) > 0:
             yield root
+
+
+def rpm_set(directory: str) -> frozenset:
+    """Identify the set of RPM files in directory.
+
+    Hardlinked files are identified as the same file, so directories
+    sharing identical (deduplicated) RPMs have the same identity.
+
+    Keyword arguments:
+        directory: The directory with RPM(s).
+
+    Returns:
+        Set of (device, inode) pairs of all contained RPMs.
+    """
+
+    stats = (os.stat(os.path.join(directory, fname))
+             for fname in fnmatch.filter(os.listdir(directory), '*.rpm'))
+    return frozenset((st.st_dev, st.st_ino) for st in stats)
+
+
+@contextmanager
+def atomic_write(filename: str, mode: str = 'w'):
+    """Open file for writing, replacing the original only on success.
+
+    The content is written to a temporary file in the same directory,
+    which replaces the target file when the context exits without exception.
+
+    Keyword arguments:
+        filename: Path to the written file.
+        mode: Mode in which the file is opened.
+
+    Returns/yields:
+        The opened temporary file.
+    """
+
+    directory, name = os.path.split(os.path.abspath(filename))
+    fd, tmpname = tempfile.mkstemp(prefix='.' + name, dir=directory)
+
+    # Same permissions as plain open() would set
+    umask = os.umask(0)
+    os.umask(umask)
+    os.fchmod(fd, 0o666 & ~umask)
+
+    try:
+        with open(fd, mode) as tmpfile:
+            yield tmpfile
+            tmpfile.flush()
+            os.fsync(tmpfile.fileno())
+        os.replace(tmpname, filename)
+    except BaseException:
+        os.unlink(tmpname)
+        raise
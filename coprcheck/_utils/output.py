@@ -1,6 +1,7 @@
 """Formatted output utilities."""
 
 
+from collections import Counter
 from contextlib import contextmanager
 from functools import partial
 import sys
@@ -43,33 +44,149 @@ def running_task(name: str) -> None:
             ))
 
 
-def report_failed(report: dict) -> None:
-    """Print (colored) report of reported fialures.
+def _diagnostic_count(checks: dict) -> int:
+    """Count all diagnostics reported for single package."""
 
-    Expected format of report:
-        {package: {check: {short_name: [diagnostics]}}}
+    return sum(len(diagnostics)
+               for errors in checks.values()
+               for diagnostics in errors.values())
+
+
+def render_summary(report: dict, top: int = 10, term: Terminal = _term) -> str:
+    """Render summary of reported failures.
+
+    The summary consists of diagnostic counts per each check and code,
+    followed by the top packages with most diagnostics.
+
+    Keyword arguments:
+        report: The failure report, in the same format as for report_failed.
+        top: Maximal number of listed packages.
+        term: Terminal used for styling the output.
+
+    Returns:
+        The rendered summary, as single string.
+    """
+
+    check_color = term.yellow
+    code_color = term.bold_red
+    pkg_color = term.bold_white
+
+    indent = '\t'
+
+    check_counts = Counter()
+    code_counts = dict()
+    pkg_counts = Counter()
+    for package, checks in report.items():
+        count = _diagnostic_count(checks)
+        # Packages which passed all checks are not failed
+        if count > 0:
+            pkg_counts[package] = count
+
+        for check, errors in checks.items():
+            codes = code_counts.setdefault(check, Counter())
+            for code, diagnostics in errors.items():
+                check_counts[check] += len(diagnostics)
+                codes[code] += len(diagnostics)
+
+    lines = ['Failure summary:']
+    for check, count in check_counts.most_common():
+        lines.append(''.join((indent*1, check_color(check), ': ', str(count))))
+
+        for code, count in code_counts[check].most_common():
+            lines.append(''.join((indent*2, code_color(code), ': ', str(count))))
+
+    lines.append('Top {} of {} failed packages:'.format(
+        min(top, len(pkg_counts)), len(pkg_counts)))
+    for package, count in pkg_counts.most_common(top):
+        lines.append(''.join((indent*1, pkg_color(package), ': ', str(count))))
+
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def render_failed(report: dict, limit: int = None, term: Terminal = _term) -> str:
+    """Render (colored) detailed report of reported failures.
+
+    Keyword arguments:
+        report: The failure report, in the same format as for report_failed.
+        limit: Maximal number of rendered diagnostics; unlimited if None.
+        term: Terminal used for styling the output.
+
+    Returns:
+        The rendered report, as single string.
     """
 
-    pkg_color = _term.bold_white
-    check_color = _term.yellow
-    code_color = _term.bold_red
-    diag_color = _term.white
+    pkg_color = term.bold_white
+    check_color = term.yellow
+    code_color = term.bold_red
+    diag_color = term.white
 
     indent = '\t'
 
-    print('Failed packages:')
+    lines = ['Failed packages:']
+    remaining = limit
+    omitted = 0
+
     for package, checks in report.items():
-        message = (indent*0, pkg_color(package), ':')
-        print(*message, sep='')
+        if remaining is not None and remaining <= 0:
+            omitted += _diagnostic_count(checks)
+            continue
+
+        lines.append(''.join((indent*0, pkg_color(package), ':')))
 
         for check, errors in checks.items():
-            message = (indent*1, check_color(check), ':')
-            print(*message, sep='')
+            check_lines = []
 
             for code, diagnostics in errors.items():
-                message = (indent*2, code_color(code), ':')
-                print(*message, sep='')
+                if remaining is not None:
+                    omitted += max(len(diagnostics) - remaining, 0)
+                    diagnostics = diagnostics[:max(remaining, 0)]
+                    remaining -= len(diagnostics)
+
+                if not diagnostics:
+                    continue
+
+                check_lines.append(''.join((indent*2, code_color(code), ':')))
+                check_lines.extend(''.join((indent*3, '- ', diag_color(diag)))
+                                   for diag in diagnostics)
+
+            if check_lines:
+                lines.append(''.join((indent*1, check_color(check), ':')))
+                lines.extend(check_lines)
+
+    if omitted:
+        lines.append('... {} more diagnostics omitted'.format(omitted))
+
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def report_failed(report: dict, summary: bool = False, limit: int = None,
+                  top: int = 10, file=None) -> None:
+    """Print (colored) report of reported failures.
+
+    The whole report is rendered in memory and written out at once.
+    Colors are used only if the output is a terminal.
+
+    Expected format of report:
+        {package: {check: {short_name: [diagnostics]}}}
+
+    Keyword arguments:
+        report: The failure report.
+        summary: Print only counts of failures instead of the full report.
+        limit: Maximal number of printed diagnostics; unlimited if None.
+        top: Maximal number of packages listed in summary.
+        file: Output stream; sys.stdout if None.
+    """
+
+    if file is None:
+        file = sys.stdout
+    term = Terminal(stream=file)
+
+    if summary:
+        output = render_summary(report, top=top, term=term)
+    else:
+        output = render_failed(report, limit=limit, term=term)
 
-                for diag in diagnostics:
-                    message = (indent*3, '- ', diag_color(diag))
-                    print(*message, sep='')
+    file.write(output)
+    file.flush()
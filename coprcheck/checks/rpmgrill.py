@@ -7,7 +7,8 @@ import os
 from shutil import rmtree
 from subprocess import check_call, DEVNULL
 
-from .. _utils.generic import require_bin, rpm_dirs
+from .. _utils.generic import require_bin, rpm_dirs, rpm_set
+from .. journal import Journal
 
 
 @require_bin('rpmgrill-unpack-rpms')
@@ -22,9 +23,12 @@ def unpacked(path):
         path to the unpacked files.
     """
 
+    resultdir = os.path.join(path, 'unpacked')
+    # Leftovers from previous interrupted run
+    rmtree(resultdir, ignore_errors=True)
+
     cmd = 'rpmgrill-unpack-rpms {0}'.format(path).split()
     check_call(cmd)
-    resultdir = os.path.join(path, 'unpacked')
 
     yield resultdir
 
@@ -60,29 +64,48 @@ def parse_results(grill_results: dict) -> (str, dict):
 
 
 @require_bin('rpmgrill')
-def scan(project_root: str) -> dict:
+def scan(project_root: str, journal: Journal = None) -> dict:
     """Run rpmgrill on all packages in the tree.
 
     *   Assumes following directory structure:
             <project_root>/<distro>/<srpm_name>/*.rpm
-        The rpmgrill is run for each <distro>/<srpm_name> variant.
+        The rpmgrill is run for each <distro>/<srpm_name> variant;
+        variants with identical (hardlinked) RPMs are grilled only once.
 
     Keyword arguments:
         project_root: Path to the stored rpms tree.
+        journal: If provided, directories already grilled according to it
+            are not grilled again, and new results are recorded in it.
     """
 
     result = dict()
+    # Results of already grilled RPM sets
+    grilled = dict()
 
     for directory in rpm_dirs(project_root):
 
-        with unpacked(directory) as grillroot:
-            cmd = ['rpmgrill', grillroot]
-            check_call(cmd, stderr=DEVNULL)
+        recorded = journal.grill_result(directory) if journal else None
+        if recorded is not None:
+            nvr, stats = recorded
+            result[nvr] = stats
+            continue
 
-            with open(os.path.join(grillroot, 'rpmgrill.json')) as res:
-                grill_stats = json.load(res)
+        rpms = rpm_set(directory)
+        if rpms in grilled:
+            nvr, stats = grilled[rpms]
+        else:
+            with unpacked(directory) as grillroot:
+                cmd = ['rpmgrill', grillroot]
+                check_call(cmd, stderr=DEVNULL)
+
+                with open(os.path.join(grillroot, 'rpmgrill.json')) as res:
+                    grill_stats = json.load(res)
+
+            nvr, stats = grilled[rpms] = parse_results(grill_stats)
 
-        nvr, stats = parse_results(grill_stats)
         result[nvr] = stats
 
+        if journal is not None:
+            journal.record_grilled(directory, nvr, stats)
+
     return result
@@ -1,15 +1,138 @@
 """Download requested COPR builds."""
 
 
+import bz2
+import fnmatch
+from functools import lru_cache
+import gzip
+import lzma
+import os
 from os import path
+import re
+from shutil import rmtree
 import subprocess
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
+from xml.etree import ElementTree
+
+import requests
 
 from . _data_def import BuildResult
+from . _utils.output import print_progress
+from . store import ArtifactStore, CHECKSUM_TYPE, checksum
+
+
+PARTIAL_DIR = '.partial'
+"""Name of the directory in which the builds are downloaded before completion."""
+
+REPOMD_NS = {'repo': 'http://linux.duke.edu/metadata/repo'}
+PRIMARY_NS = {'common': 'http://linux.duke.edu/metadata/common'}
+
+DECOMPRESS = {
+    '.gz': gzip.decompress,
+    '.xz': lzma.decompress,
+    '.bz2': bz2.decompress,
+}
+"""Supported compressions of the primary metadata, by file extension."""
+
+ERE_SPECIAL = re.compile(r'([.^$*+?()[\]{}|\\])')
+"""Characters with special meaning in POSIX extended regular expressions."""
+
+
+class ChecksumMismatchError(RuntimeError):
+    """Downloaded file does not match its checksum from repodata."""
+
+
+def _primary_checksums(repo_url: str) -> dict:
+    """Read checksums of all packages from the repository primary metadata.
+
+    Args:
+        repo_url: Full URL of the repository, with trailing slash.
+
+    Returns:
+        Mapping of package location (relative to repo_url) to its checksum.
+        Empty if the repository has no (usable) repodata.
+
+    Raises:
+        RequestException: On network or server errors.
+        ParseError: On malformed metadata.
+        OSError, EOFError, LZMAError: On corrupted compressed metadata.
+    """
+
+    rsp = requests.get(urljoin(repo_url, 'repodata/repomd.xml'))
+    if rsp.status_code == requests.codes.not_found:
+        return dict()
+    rsp.raise_for_status()
+
+    repomd = ElementTree.fromstring(rsp.content)
+    location = repomd.find("repo:data[@type='primary']/repo:location", REPOMD_NS)
+    if location is None:
+        return dict()
+
+    href = location.get('href')
+    decompress = DECOMPRESS.get(path.splitext(href)[1])
+    if decompress is None:
+        print_progress('Unsupported repodata format, packages will not be'
+                       ' deduplicated before download: {}'.format(href))
+        return dict()
+
+    rsp = requests.get(urljoin(repo_url, href))
+    rsp.raise_for_status()
+
+    primary = ElementTree.fromstring(decompress(rsp.content))
+    packages = (
+        (pkg.find('common:location', PRIMARY_NS),
+         pkg.find('common:checksum', PRIMARY_NS))
+        for pkg in primary.iterfind('common:package', PRIMARY_NS))
+
+    return {location.get('href'): digest.text
+            for location, digest in packages
+            if digest.get('type') == CHECKSUM_TYPE}
+
+
+@lru_cache()
+def repodata_checksums(repo_url: str) -> dict:
+    """Get checksums of all packages in the repository.
+
+    Only packages with checksums of the store type are reported.
+    The repodata only allow skipping of already stored packages,
+    so any failure to read them is reported and treated as no repodata.
+
+    Args:
+        repo_url: Full URL of the repository (the chroot results).
+
+    Returns:
+        Mapping of package location (relative to repo_url) to its checksum.
+        Empty if the repository has no (usable) repodata.
+    """
+
+    repo_url = repo_url.rstrip('/') + '/'
+
+    try:
+        return _primary_checksums(repo_url)
+    except (requests.RequestException, ElementTree.ParseError,
+            OSError, EOFError, lzma.LZMAError) as err:
+        print_progress('Cannot read repodata of {}, packages will not be'
+                       ' deduplicated before download: {}'.format(repo_url, err))
+        return dict()
+
+
+def _wget_file(remote_file: str, local_file: str) -> None:
+    """Download single remote file to the local path.
+
+    Args:
+        remote_file: Full URL of the downloaded file.
+        local_file: Path to which the file should be saved.
+    """
+
+    cmd = ['wget', '--quiet']
+    cmd += ['--output-document={}'.format(path.expanduser(local_file))]
+    cmd += [remote_file]
+
+    subprocess.check_call(cmd)
 
 
 def _wget_dir(remote_dir: str, local_root: str,
-              accept: [str] = ['rpm', 'log.gz']) -> None:
+              accept: [str] = ['rpm', 'log.gz'], reject: [str] = []) -> None:
     """Download contents of the remote directory to the local root.
 
     The last segment od the remote_dir is recreated in local_root
@@ -21,6 +144,7 @@ def _wget_dir(remote_dir: str, local_root: str,
         remote_dir: Full URL to the downloaded directory.
         local_root: Directory to which the results should be saved.
         accept: List of accepted extensions
+        reject: List of exact file names not to be downloaded
     """
 
     remote_path = urlparse(remote_dir).path
@@ -35,6 +159,10 @@ def _wget_dir(remote_dir: str, local_root: str,
     # Downloading options
     cmd += ['--recursive', '--no-parent', '--level=1']
     cmd += ["--accept=*.{ext}".format(ext=e) for e in accept]
+    if reject:
+        # Plain --reject would match the names as suffixes
+        names = '|'.join(ERE_SPECIAL.sub(r'\\\1', n) for n in reject)
+        cmd += ["--reject-regex=/({})$".format(names)]
     # Download source
     cmd += [remote_dir]
 
@@ -42,7 +170,68 @@ def _wget_dir(remote_dir: str, local_root: str,
 
 
 def fetch_build(build: BuildResult, prefix: str = '.') -> None:
-    local_root = path.join(prefix, build.chroot.distribution)
+    """Download the build artifacts into the distribution directory.
+
+    The artifacts are first downloaded to a staging directory and moved
+    to their final place only when the download completes, so an
+    interrupted download never leaves partial files behind.
+
+    The packages are kept in the artifact store of the prefix, and only
+    hardlinked into the distribution directory. Packages with checksum
+    in the repodata are downloaded only if not already stored.
+
+    Args:
+        build: The build to download.
+        prefix: Root directory of the downloaded project.
+
+    Raises:
+        ChecksumMismatchError: When downloaded package is corrupted.
+    """
+
+    store = ArtifactStore(prefix)
+
+    local_root = path.join(path.expanduser(prefix), build.chroot.distribution)
     local_root = path.normpath(local_root)
+    partial_root = path.join(local_root, PARTIAL_DIR)
+
+    name = path.basename(build.directory)
+    downloaded = path.join(partial_root, name)
+    complete = path.join(local_root, name)
+
+    # Leftovers from previous interrupted download
+    rmtree(partial_root, ignore_errors=True)
+    os.makedirs(downloaded)
+
+    # Packages listed in repodata are fetched only when not in store yet
+    remote_dir = build.url.rstrip('/') + '/'
+    known = {
+        path.basename(location): digest
+        for location, digest in repodata_checksums(urljoin(remote_dir, '..')).items()
+        if path.dirname(location) == name
+    }
+
+    for fname, digest in known.items():
+        local_file = path.join(downloaded, fname)
+
+        if digest in store:
+            store.link(digest, local_file)
+            continue
+
+        _wget_file(urljoin(remote_dir, fname), local_file)
+        if checksum(local_file) != digest:
+            raise ChecksumMismatchError(urljoin(remote_dir, fname))
+        store.add(local_file)
+
+    # The rest is fetched unconditionally and deduplicated afterwards
+    _wget_dir(build.url, partial_root, reject=list(known))
+
+    for fname in fnmatch.filter(os.listdir(downloaded), '*.rpm'):
+        if fname not in known:
+            store.add(path.join(downloaded, fname))
+
+    # Builds for multiple arches share the directory; merge them
+    os.makedirs(complete, exist_ok=True)
+    for fname in os.listdir(downloaded):
+        os.replace(path.join(downloaded, fname), path.join(complete, fname))
 
-    return _wget_dir(build.url, local_root)
+    rmtree(partial_root, ignore_errors=True)
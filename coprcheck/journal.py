@@ -0,0 +1,141 @@
+"""Journal of finished work, allowing interrupted runs to be resumed."""
+
+
+import json
+import os
+
+from . _data_def import BuildResult
+
+
+JOURNAL_NAME = '.coprcheck-journal'
+
+
+class Journal:
+    """Append-only record of fetched builds and grilled directories.
+
+    Each finished piece of work is written as a single JSON line and
+    synced to disk before being considered done. Incomplete trailing
+    lines, left by an interrupted write, are ignored on replay.
+    """
+
+    def __init__(self, root: str, resume: bool = False,
+                 reuse_results: bool = True):
+        """Open the journal in the root directory.
+
+        Keyword arguments:
+            root: The target directory of the run.
+            resume: Replay existing journal instead of starting anew.
+            reuse_results: Keep the replayed grill results; if False,
+                they are discarded, also for any later replay.
+        """
+
+        self.root = os.path.expanduser(root)
+        self.path = os.path.join(self.root, JOURNAL_NAME)
+
+        self.fetched = set()
+        self.grilled = dict()
+
+        os.makedirs(self.root, exist_ok=True)
+        if resume and os.path.exists(self.path):
+            self._replay()
+
+        self._file = open(self.path, 'a' if resume else 'w')
+
+        if resume and not reuse_results:
+            self._write({'event': 'reset'})
+            self.grilled.clear()
+
+    def _replay(self) -> None:
+        """Load records of finished work from existing journal.
+
+        Trailing incomplete record, if any, is cut off the journal.
+        """
+
+        complete = 0
+
+        with open(self.path, 'rb') as journal:
+            for line in journal:
+                # Interrupted write; everything after it is suspect
+                if not line.endswith(b'\n'):
+                    break
+
+                try:
+                    record = json.loads(line.decode('utf-8'))
+
+                    if record['event'] == 'fetched':
+                        self.fetched.add(record['url'])
+                        self.grilled.pop(record['directory'], None)
+                    elif record['event'] == 'reset':
+                        self.grilled.clear()
+                    elif record['event'] == 'grilled':
+                        self.grilled[record['directory']] = (
+                            record['package'], record['result'])
+                except (ValueError, KeyError, TypeError):
+                    break
+
+                complete += len(line)
+
+        os.truncate(self.path, complete)
+
+    def _write(self, record: dict) -> None:
+        """Durably append the record to the journal."""
+
+        self._file.write(json.dumps(record, sort_keys=True) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def is_fetched(self, build: BuildResult) -> bool:
+        """Check if the build was already fetched."""
+        return build.url in self.fetched
+
+    def record_fetched(self, build: BuildResult) -> None:
+        """Record that the build was fetched completely.
+
+        The grill result of the directory the build was fetched into
+        no longer applies, as the directory contents changed.
+        """
+
+        self._write({
+            'event': 'fetched',
+            'url': build.url,
+            'directory': build.directory,
+            })
+        self.fetched.add(build.url)
+        self.grilled.pop(build.directory, None)
+
+    def grill_result(self, directory: str) -> (str, dict):
+        """Get recorded result for the directory, or None if not grilled yet.
+
+        Keyword arguments:
+            directory: Path to the grilled directory.
+        """
+
+        return self.grilled.get(os.path.relpath(directory, self.root))
+
+    def record_grilled(self, directory: str, package: str, result: dict) -> None:
+        """Record the result of grilling the directory.
+
+        Keyword arguments:
+            directory: Path to the grilled directory.
+            package: NVR of the grilled package.
+            result: The parsed results of the grill.
+        """
+
+        directory = os.path.relpath(directory, self.root)
+        self._write({
+            'event': 'grilled',
+            'directory': directory,
+            'package': package,
+            'result': result,
+            })
+        self.grilled[directory] = (package, result)
+
+    def close(self) -> None:
+        """Close the journal file."""
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,87 @@
+"""Content-addressed store of downloaded artifacts."""
+
+
+import hashlib
+import os
+
+
+STORE_NAME = '.store'
+
+CHECKSUM_TYPE = 'sha256'
+"""Type of checksums identifying the stored files."""
+
+
+def checksum(filename: str, chunk_size: int = 2**20) -> str:
+    """Compute the hex digest of the file contents."""
+
+    digest = hashlib.new(CHECKSUM_TYPE)
+    with open(filename, 'rb') as contents:
+        for chunk in iter(lambda: contents.read(chunk_size), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class ArtifactStore:
+    """Store of unique files, shared by hardlinks.
+
+    Each file is stored once, under its checksum, and hardlinked to every
+    place it is required. The store is located inside the project root,
+    so the links never cross filesystem boundary.
+    """
+
+    def __init__(self, root: str):
+        """Open the store in the root directory.
+
+        Keyword arguments:
+            root: The target directory of the run.
+        """
+
+        self.root = os.path.join(os.path.expanduser(root), STORE_NAME)
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, digest: str) -> str:
+        """Path to the stored file with the checksum."""
+        return os.path.join(self.root, digest[:2], digest)
+
+    def __contains__(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    def link(self, digest: str, target: str) -> None:
+        """Hardlink stored file to the target path, replacing existing file.
+
+        Keyword arguments:
+            digest: Checksum of the stored file.
+            target: The path of the new link.
+        """
+
+        tmpname = target + '.tmp'
+        if os.path.lexists(tmpname):
+            os.unlink(tmpname)
+
+        os.link(self.path(digest), tmpname)
+        os.replace(tmpname, target)
+
+    def add(self, filename: str) -> str:
+        """Put file in the store, deduplicating it.
+
+        If the same file is already stored, the passed one is replaced by
+        a link to it; otherwise the file itself is linked into the store.
+
+        Keyword arguments:
+            filename: Path to the added file.
+
+        Returns:
+            The checksum of the file.
+        """
+
+        digest = checksum(filename)
+
+        if digest in self:
+            if not os.path.samefile(self.path(digest), filename):
+                self.link(digest, filename)
+        else:
+            os.makedirs(os.path.dirname(self.path(digest)), exist_ok=True)
+            os.link(filename, self.path(digest))
+
+        return digest
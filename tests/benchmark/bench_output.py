@@ -0,0 +1,113 @@
+"""Benchmark of rendering very large failure reports.
+
+Compares the buffered renderer with the former line-by-line printing,
+writing into memory, a regular file and a pipe.
+
+Run as:
+    PYTHONPATH=. python tests/benchmark/bench_output.py [PACKAGES [DIAGNOSTICS]]
+"""
+
+from contextlib import contextmanager
+import io
+import subprocess
+import sys
+import tempfile
+import timeit
+
+from coprcheck._utils.output import Terminal, report_failed
+
+
+def make_report(packages: int, diagnostics: int) -> dict:
+    """Create report with given number of packages and diagnostics per package."""
+
+    return {
+        'pkg{:05d}-1.0-1.fc24'.format(p): {'rpmgrill': {
+            'Check{:d}'.format(c): [
+                'Code{:d}: diagnostic #{:d}'.format(d % 7, d)
+                for d in range(diagnostics // 4)
+            ] for c in range(4)
+        }} for p in range(packages)
+    }
+
+
+def report_failed_per_line(report: dict, file) -> None:
+    """The original report_failed, issuing one print() per line."""
+
+    term = Terminal(stream=file)
+
+    pkg_color = term.bold_white
+    check_color = term.yellow
+    code_color = term.bold_red
+    diag_color = term.white
+
+    indent = '\t'
+
+    print('Failed packages:', file=file)
+    for package, checks in report.items():
+        message = (indent*0, pkg_color(package), ':')
+        print(*message, sep='', file=file)
+
+        for check, errors in checks.items():
+            message = (indent*1, check_color(check), ':')
+            print(*message, sep='', file=file)
+
+            for code, diagnostics in errors.items():
+                message = (indent*2, code_color(code), ':')
+                print(*message, sep='', file=file)
+
+                for diag in diagnostics:
+                    message = (indent*3, '- ', diag_color(diag))
+                    print(*message, sep='', file=file)
+
+
+@contextmanager
+def memory_output():
+    yield io.StringIO()
+
+
+@contextmanager
+def file_output():
+    with tempfile.TemporaryFile('w') as output:
+        yield output
+
+
+@contextmanager
+def pipe_output():
+    reader = subprocess.Popen(['cat'], stdin=subprocess.PIPE,
+                              stdout=subprocess.DEVNULL,
+                              universal_newlines=True)
+    try:
+        yield reader.stdin
+    finally:
+        reader.stdin.close()
+        reader.wait()
+
+
+def main(packages: int = 1000, diagnostics: int = 100, repeat: int = 3) -> None:
+    report = make_report(packages, diagnostics)
+
+    renderers = [
+        ('per-line', report_failed_per_line),
+        ('full', report_failed),
+        ('limited', lambda report, file: report_failed(report, limit=1000, file=file)),
+        ('summary', lambda report, file: report_failed(report, summary=True, file=file)),
+    ]
+    outputs = [
+        ('memory', memory_output),
+        ('file', file_output),
+        ('pipe', pipe_output),
+    ]
+
+    for out_name, output in outputs:
+        for name, render in renderers:
+            def run():
+                with output() as file:
+                    render(report, file=file)
+                    file.flush()
+
+            best = min(timeit.repeat(run, number=1, repeat=repeat))
+            print('{:>6} {:>8}: {:.3f}s'.format(out_name, name, best))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,259 @@
+"""Unit tests for the fetch module of the coprcheck package."""
+
+import bz2
+import gzip
+import lzma
+import os
+import re
+import subprocess
+
+import pytest
+import responses
+
+from coprcheck import fetch, store
+from coprcheck._data_def import BuildResult, Chroot
+
+
+# ### Common test data ###
+BUILD = BuildResult(
+        build_id=42,
+        chroot=Chroot.from_chroot_name('fedora-rawhide-x86_64'),
+        url='http://localhost/results/00000042-foo/')
+
+# ### Fixtures ###
+def fake_wget(fail: bool):
+    """Create _wget_dir replacement, which possibly fails mid-download."""
+
+    def _wget_dir(remote_dir, local_root, reject=[]):
+        target = os.path.join(local_root, '00000042-foo')
+        os.makedirs(target, exist_ok=True)
+        with open(os.path.join(target, 'foo-1.0-1.fc24.x86_64.rpm'), 'w') as rpm:
+            rpm.write('x86_64')
+
+        if fail:
+            raise subprocess.CalledProcessError(8, 'wget')
+
+    return _wget_dir
+
+def make_repomd(href: str) -> str:
+    """Create repomd.xml pointing to the primary metadata."""
+
+    return (
+        '<repomd xmlns="http://linux.duke.edu/metadata/repo">'
+        '<data type="primary"><location href="{}"/></data>'
+        '</repomd>'
+        ).format(href)
+
+def make_primary(packages: dict) -> bytes:
+    """Create primary.xml from {location: (checksum_type, checksum)} mapping."""
+
+    entries = ''.join(
+        '<package type="rpm">'
+        '<checksum type="{}" pkgid="YES">{}</checksum>'
+        '<location href="{}"/>'
+        '</package>'.format(ctype, digest, location)
+        for location, (ctype, digest) in packages.items())
+
+    return (
+        '<metadata xmlns="http://linux.duke.edu/metadata/common">'
+        '{}</metadata>'
+        ).format(entries).encode('utf-8')
+
+@pytest.fixture
+def no_repodata(monkeypatch):
+    """Repository without repodata."""
+    monkeypatch.setattr(fetch, 'repodata_checksums', lambda url: {})
+
+@pytest.fixture
+def warnings(monkeypatch):
+    """Record of progress messages (warnings) printed by fetch."""
+
+    messages = []
+    monkeypatch.setattr(fetch, 'print_progress', messages.append)
+    return messages
+
+@pytest.fixture(autouse=True)
+def clear_repodata_cache():
+    """Repodata are not cached between tests."""
+    fetch.repodata_checksums.cache_clear()
+
+# ### Repodata tests ###
+
+REPO_URL = 'http://localhost/results/'
+
+PACKAGES = {
+    '00000042-foo/foo-1.0-1.fc24.noarch.rpm': ('sha256', 'a'*64),
+    '00000042-foo/foo-1.0-1.fc24.x86_64.rpm': ('sha1', 'b'*40),
+    '00000043-bar/bar-1.0-1.fc24.noarch.rpm': ('sha256', 'c'*64),
+}
+
+@pytest.mark.parametrize('extension,compress', [
+    ('gz', gzip.compress),
+    ('xz', lzma.compress),
+    ('bz2', bz2.compress),
+])
+@responses.activate
+def test_repodata_checksums(extension, compress):
+    href = 'repodata/0123-primary.xml.' + extension
+    responses.add(responses.GET, REPO_URL + 'repodata/repomd.xml',
+                  status=200, body=make_repomd(href))
+    responses.add(responses.GET, REPO_URL + href,
+                  status=200, body=compress(make_primary(PACKAGES)))
+
+    assert fetch.repodata_checksums(REPO_URL) == {
+        '00000042-foo/foo-1.0-1.fc24.noarch.rpm': 'a'*64,
+        '00000043-bar/bar-1.0-1.fc24.noarch.rpm': 'c'*64,
+    }
+
+@responses.activate
+def test_repodata_checksums_no_repodata():
+    responses.add(responses.GET, REPO_URL + 'repodata/repomd.xml',
+                  status=404, body='Not Found')
+
+    assert fetch.repodata_checksums(REPO_URL) == {}
+
+@responses.activate
+def test_repodata_checksums_unsupported(warnings):
+    href = 'repodata/0123-primary.xml.zst'
+    responses.add(responses.GET, REPO_URL + 'repodata/repomd.xml',
+                  status=200, body=make_repomd(href))
+
+    assert fetch.repodata_checksums(REPO_URL) == {}
+    assert len(warnings) == 1 and href in warnings[0]
+
+@pytest.mark.parametrize('primary_status,primary_body', [
+    (500, b'500 Internal Server Error'),
+    (200, b'corrupted archive'),
+    (200, gzip.compress(b'<metadata><package></metadata>')),
+])
+@responses.activate
+def test_repodata_checksums_bad_primary(warnings, primary_status, primary_body):
+    href = 'repodata/0123-primary.xml.gz'
+    responses.add(responses.GET, REPO_URL + 'repodata/repomd.xml',
+                  status=200, body=make_repomd(href))
+    responses.add(responses.GET, REPO_URL + href,
+                  status=primary_status, body=primary_body)
+
+    assert fetch.repodata_checksums(REPO_URL) == {}
+    assert len(warnings) == 1 and REPO_URL in warnings[0]
+
+@pytest.mark.parametrize('repomd_status,repomd_body', [
+    (500, '500 Internal Server Error'),
+    (200, '<repomd xmlns="http://linux.duke.edu/metadata/repo">'),
+])
+@responses.activate
+def test_repodata_checksums_bad_repomd(warnings, repomd_status, repomd_body):
+    responses.add(responses.GET, REPO_URL + 'repodata/repomd.xml',
+                  status=repomd_status, body=repomd_body)
+
+    assert fetch.repodata_checksums(REPO_URL) == {}
+    assert len(warnings) == 1 and REPO_URL in warnings[0]
+
+# ### Download tests ###
+
+def test_wget_dir_reject_exact(monkeypatch):
+    commands = []
+    monkeypatch.setattr(fetch.subprocess, 'check_call', commands.append)
+
+    fetch._wget_dir(BUILD.url, '.', reject=['foo-1.0-1.fc24.noarch.rpm'])
+
+    reject, = [arg.split('=', 1)[1] for arg in commands[0]
+               if arg.startswith('--reject-regex=')]
+    assert re.search(reject, BUILD.url + 'foo-1.0-1.fc24.noarch.rpm')
+    assert not re.search(reject, BUILD.url + 'python3-foo-1.0-1.fc24.noarch.rpm')
+    assert not re.search(reject, BUILD.url + 'foo-1.0-1.fc24Xnoarch.rpm')
+
+# ### Fetch tests ###
+
+def test_fetch_build_complete(no_repodata, monkeypatch, tmpdir):
+    monkeypatch.setattr(fetch, '_wget_dir', fake_wget(fail=False))
+    fetch.fetch_build(BUILD, str(tmpdir))
+
+    distribution = tmpdir.join('fedora-rawhide')
+    assert distribution.join('00000042-foo', 'foo-1.0-1.fc24.x86_64.rpm').check()
+    assert not distribution.join(fetch.PARTIAL_DIR).check()
+
+def test_fetch_build_interrupted(no_repodata, monkeypatch, tmpdir):
+    monkeypatch.setattr(fetch, '_wget_dir', fake_wget(fail=True))
+    with pytest.raises(subprocess.CalledProcessError):
+        fetch.fetch_build(BUILD, str(tmpdir))
+
+    assert not tmpdir.join('fedora-rawhide', '00000042-foo').check()
+
+def test_fetch_build_merge_arches(no_repodata, monkeypatch, tmpdir):
+    existing = tmpdir.join('fedora-rawhide', '00000042-foo', 'foo-1.0-1.fc24.i686.rpm')
+    existing.ensure()
+
+    monkeypatch.setattr(fetch, '_wget_dir', fake_wget(fail=False))
+    fetch.fetch_build(BUILD, str(tmpdir))
+
+    assert existing.check()
+    assert existing.dirpath().join('foo-1.0-1.fc24.x86_64.rpm').check()
+
+def test_fetch_build_known_checksum(monkeypatch, tmpdir):
+    noarch = 'foo-1.0-1.fc24.noarch.rpm'
+    digest = store.checksum(str(tmpdir.join('noarch').ensure()))
+    monkeypatch.setattr(fetch, 'repodata_checksums',
+                        lambda url: {'00000042-foo/' + noarch: digest})
+
+    downloads = []
+    def _wget_file(remote_file, local_file):
+        downloads.append(remote_file)
+        open(local_file, 'w').close()
+
+    monkeypatch.setattr(fetch, '_wget_file', _wget_file)
+    monkeypatch.setattr(fetch, '_wget_dir', fake_wget(fail=False))
+
+    for chroot in ['fedora-rawhide-x86_64', 'fedora-24-x86_64']:
+        fetch.fetch_build(BUILD._replace(
+            chroot=Chroot.from_chroot_name(chroot)), str(tmpdir))
+
+    assert downloads == [BUILD.url + noarch]
+    assert tmpdir.join('fedora-rawhide', '00000042-foo', noarch).samefile(
+            tmpdir.join('fedora-24', '00000042-foo', noarch))
+    assert tmpdir.join('fedora-rawhide', '00000042-foo', 'foo-1.0-1.fc24.x86_64.rpm').samefile(
+            tmpdir.join('fedora-24', '00000042-foo', 'foo-1.0-1.fc24.x86_64.rpm'))
+
+def test_fetch_build_checksum_mismatch(monkeypatch, tmpdir):
+    monkeypatch.setattr(fetch, 'repodata_checksums',
+                        lambda url: {'00000042-foo/foo.noarch.rpm': '0'*64})
+    monkeypatch.setattr(fetch, '_wget_file',
+                        lambda remote, local: open(local, 'w').close())
+
+    with pytest.raises(fetch.ChecksumMismatchError):
+        fetch.fetch_build(BUILD, str(tmpdir))
+
+    assert not tmpdir.join('fedora-rawhide', '00000042-foo').check()
+    assert not tmpdir.join('.store').listdir()
+
+@responses.activate
+def test_fetch_build_repodata(monkeypatch, tmpdir):
+    noarch = 'foo-1.0-1.fc24.noarch.rpm'
+    digest = store.checksum(str(tmpdir.join('noarch').ensure()))
+
+    href = 'repodata/0123-primary.xml.gz'
+    responses.add(responses.GET, REPO_URL + 'repodata/repomd.xml',
+                  status=200, body=make_repomd(href))
+    responses.add(responses.GET, REPO_URL + href,
+                  status=200, body=gzip.compress(make_primary({
+                      '00000042-foo/' + noarch: ('sha256', digest),
+                      '00000043-bar/bar-1.0-1.fc24.noarch.rpm': ('sha256', 'c'*64),
+                  })))
+
+    downloads = []
+    def _wget_file(remote_file, local_file):
+        downloads.append(remote_file)
+        open(local_file, 'w').close()
+
+    rejected = []
+    def _wget_dir(remote_dir, local_root, reject=[]):
+        rejected.extend(reject)
+
+    monkeypatch.setattr(fetch, '_wget_file', _wget_file)
+    monkeypatch.setattr(fetch, '_wget_dir', _wget_dir)
+
+    fetch.fetch_build(BUILD, str(tmpdir))
+
+    assert downloads == [BUILD.url + noarch]
+    assert rejected == [noarch]
+    assert tmpdir.join('fedora-rawhide', '00000042-foo', noarch).check()
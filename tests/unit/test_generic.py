@@ -0,0 +1,37 @@
+"""Unit tests for the generic utilities of the coprcheck package."""
+
+import os
+import stat
+
+import pytest
+
+from coprcheck._utils import generic
+
+
+# ### Atomic write tests ###
+
+@pytest.mark.parametrize('umask', [0o022, 0o077])
+def test_atomic_write_permissions(tmpdir, umask):
+    report = tmpdir.join('report.yml')
+
+    original = os.umask(umask)
+    try:
+        with generic.atomic_write(str(report)) as output:
+            output.write('report')
+    finally:
+        os.umask(original)
+
+    assert report.read() == 'report'
+    assert stat.S_IMODE(report.stat().mode) == 0o666 & ~umask
+
+def test_atomic_write_failure(tmpdir):
+    report = tmpdir.join('report.yml')
+    report.write('original')
+
+    with pytest.raises(RuntimeError):
+        with generic.atomic_write(str(report)) as output:
+            output.write('partial')
+            raise RuntimeError('Interrupted')
+
+    assert report.read() == 'original'
+    assert tmpdir.listdir() == [report]
@@ -0,0 +1,85 @@
+"""Unit tests for the journal module of the coprcheck package."""
+
+import pytest
+
+from coprcheck import journal as jrnl
+from coprcheck._data_def import BuildResult, Chroot
+
+
+# ### Common test data ###
+BUILD = BuildResult(
+        build_id=42,
+        chroot=Chroot.from_chroot_name('fedora-rawhide-x86_64'),
+        url='http://localhost/results/00000042-foo/')
+
+GRILL_RESULT = ('foo-1.0-1.fc24', {'ManPages': {'ManPageMissing': 'no man page'}})
+
+# ### Fixtures ###
+@pytest.fixture
+def finished_journal(tmpdir):
+    """Journal with one build fetched and one directory grilled."""
+
+    with jrnl.Journal(str(tmpdir)) as journal:
+        journal.record_fetched(BUILD)
+        journal.record_grilled(str(tmpdir.join('fedora-rawhide', '00000042-foo')),
+                               *GRILL_RESULT)
+
+    return tmpdir
+
+# ### Tests ###
+
+def test_journal_resume(finished_journal):
+    with jrnl.Journal(str(finished_journal), resume=True) as journal:
+        assert journal.is_fetched(BUILD)
+        assert journal.grill_result(str(
+            finished_journal.join('fedora-rawhide', '00000042-foo'))) == GRILL_RESULT
+        assert journal.grill_result(str(
+            finished_journal.join('fedora-rawhide', '00000043-bar'))) is None
+
+def test_journal_restart(finished_journal):
+    with jrnl.Journal(str(finished_journal)) as journal:
+        assert not journal.is_fetched(BUILD)
+        assert not journal.grilled
+
+def test_journal_interrupted_write(finished_journal):
+    path = finished_journal.join(jrnl.JOURNAL_NAME)
+    path.write('{"event": "fetched", "url": "http://loc', mode='a')
+
+    with jrnl.Journal(str(finished_journal), resume=True) as journal:
+        assert journal.is_fetched(BUILD)
+        journal.record_fetched(BUILD._replace(url='http://localhost/other/'))
+
+    with jrnl.Journal(str(finished_journal), resume=True) as journal:
+        assert journal.fetched == {BUILD.url, 'http://localhost/other/'}
+
+def test_journal_malformed_record(finished_journal):
+    path = finished_journal.join(jrnl.JOURNAL_NAME)
+    path.write('{"url": "http://localhost/other/"}\n', mode='a')
+
+    with jrnl.Journal(str(finished_journal), resume=True) as journal:
+        assert journal.fetched == {BUILD.url}
+
+def test_journal_fetch_invalidates_grill(finished_journal):
+    directory = str(finished_journal.join('fedora-rawhide', '00000042-foo'))
+    other_arch = BUILD._replace(
+            chroot=Chroot.from_chroot_name('fedora-rawhide-i386'),
+            url='http://localhost/results/i386/00000042-foo/')
+
+    with jrnl.Journal(str(finished_journal), resume=True) as journal:
+        journal.record_fetched(other_arch)
+        assert journal.grill_result(directory) is None
+
+    with jrnl.Journal(str(finished_journal), resume=True) as journal:
+        assert journal.grill_result(directory) is None
+
+def test_journal_discard_results(finished_journal):
+    directory = str(finished_journal.join('fedora-rawhide', '00000042-foo'))
+
+    with jrnl.Journal(str(finished_journal), resume=True,
+                      reuse_results=False) as journal:
+        assert journal.is_fetched(BUILD)
+        assert journal.grill_result(directory) is None
+
+    with jrnl.Journal(str(finished_journal), resume=True) as journal:
+        assert journal.is_fetched(BUILD)
+        assert journal.grill_result(directory) is None
@@ -0,0 +1,81 @@
+"""Unit tests for the output utilities of the coprcheck package."""
+
+import io
+
+import pytest
+
+from coprcheck._utils import output
+
+
+# ### Common test data ###
+REPORT = {
+    'foo-1.0-1.fc24': {'rpmgrill': {
+        'BuildIds': ['MissingBuildIds: no build ids'],
+        'ManPages': ['ManPageMissing: no man page', 'ManPageMissing: again'],
+    }},
+    'bar-2.0-1.fc24': {'rpmgrill': {
+        'ManPages': ['ManPageMissing: no man page'],
+    }},
+}
+
+# ### Fixtures ###
+@pytest.fixture
+def plain_term():
+    """Terminal without styling capabilities."""
+    return output.Terminal(stream=io.StringIO())
+
+# ### Detailed report tests ###
+
+def test_render_failed_complete(plain_term):
+    rendered = output.render_failed(REPORT, term=plain_term)
+    lines = rendered.splitlines()
+
+    assert lines[0] == 'Failed packages:'
+    assert len([l for l in lines if l.startswith('\t\t\t- ')]) == 4
+    assert 'omitted' not in rendered
+
+def test_render_failed_limit(plain_term):
+    rendered = output.render_failed(REPORT, limit=2, term=plain_term)
+    lines = rendered.splitlines()
+
+    assert len([l for l in lines if l.startswith('\t\t\t- ')]) == 2
+    assert lines[-1] == '... 2 more diagnostics omitted'
+    assert 'bar-2.0-1.fc24:' not in lines
+
+def test_render_failed_zero_limit(plain_term):
+    rendered = output.render_failed(REPORT, limit=0, term=plain_term)
+    assert rendered.splitlines() == [
+        'Failed packages:', '... 4 more diagnostics omitted']
+
+# ### Summary tests ###
+
+def test_render_summary_counts(plain_term):
+    lines = output.render_summary(REPORT, term=plain_term).splitlines()
+
+    assert '\trpmgrill: 4' in lines
+    assert '\t\tManPages: 3' in lines
+    assert '\t\tBuildIds: 1' in lines
+    assert lines.index('\t\tManPages: 3') < lines.index('\t\tBuildIds: 1')
+
+def test_render_summary_clean_package(plain_term):
+    report = dict(REPORT, **{'baz-3.0-1.fc24': {'rpmgrill': {}}})
+    lines = output.render_summary(report, top=5, term=plain_term).splitlines()
+
+    assert 'Top 2 of 2 failed packages:' in lines
+    assert not [l for l in lines if 'baz-3.0-1.fc24' in l]
+
+def test_render_summary_top(plain_term):
+    lines = output.render_summary(REPORT, top=1, term=plain_term).splitlines()
+
+    assert 'Top 1 of 2 failed packages:' in lines
+    assert lines[-1] == '\tfoo-1.0-1.fc24: 3'
+
+# ### Report printing tests ###
+
+def test_report_failed_no_tty():
+    stream = io.StringIO()
+    output.report_failed(REPORT, file=stream)
+
+    assert stream.getvalue() == output.render_failed(
+            REPORT, term=output.Terminal(stream=io.StringIO()))
+    assert '\x1b' not in stream.getvalue()
@@ -0,0 +1,90 @@
+"""Unit tests for the rpmgrill check of the coprcheck package."""
+
+import json
+import os
+
+import pytest
+
+from coprcheck._utils import generic
+from coprcheck.checks import rpmgrill
+from coprcheck.journal import Journal
+
+
+# ### Common test data ###
+GRILL_JSON = {
+    'package': {'name': 'foo', 'version': '1.0', 'release': '1.fc24'},
+    'tests': [
+        {'module': 'ManPages', 'results': [
+            {'code': 'ManPageMissing', 'diag': 'no man page'}]},
+        {'module': 'BuildIds', 'results': []},
+    ],
+}
+
+EXPECTED_RESULT = ('foo-1.0-1.fc24', {'ManPages': {'ManPageMissing': 'no man page'}})
+
+DIRECTORIES = [
+    os.path.join('fedora-23', '00000042-foo'),
+    os.path.join('fedora-24', '00000042-foo'),
+]
+
+# ### Fixtures ###
+@pytest.fixture
+def project(tmpdir):
+    """Project tree with one RPM hardlinked into two distributions."""
+
+    stored = tmpdir.join('.store', 'foo-1.0-1.fc24.noarch.rpm')
+    stored.write('noarch', ensure=True)
+
+    for directory in DIRECTORIES:
+        tmpdir.join(directory).ensure(dir=True)
+        os.link(str(stored), str(tmpdir.join(directory, stored.basename)))
+
+    return tmpdir
+
+@pytest.fixture
+def grill_calls(monkeypatch):
+    """Fake rpmgrill binaries, recording their calls."""
+
+    calls = []
+
+    def check_call(cmd, **kwargs):
+        calls.append(cmd)
+
+        if cmd[0] == 'rpmgrill-unpack-rpms':
+            os.makedirs(os.path.join(cmd[1], 'unpacked'))
+        elif cmd[0] == 'rpmgrill':
+            with open(os.path.join(cmd[1], 'rpmgrill.json'), 'w') as res:
+                json.dump(GRILL_JSON, res)
+
+    monkeypatch.setattr(generic, 'find_executable', lambda binary: binary)
+    monkeypatch.setattr(rpmgrill, 'check_call', check_call)
+    return calls
+
+# ### Tests ###
+
+def test_scan_shared_rpm_set(project, grill_calls):
+    with Journal(str(project)) as journal:
+        result = rpmgrill.scan(str(project), journal=journal)
+
+        assert [cmd[0] for cmd in grill_calls] == ['rpmgrill-unpack-rpms', 'rpmgrill']
+        assert result == dict([EXPECTED_RESULT])
+        for directory in DIRECTORIES:
+            assert journal.grill_result(str(project.join(directory))) == EXPECTED_RESULT
+
+def test_scan_recorded_results(project, grill_calls):
+    with Journal(str(project)) as journal:
+        for directory in DIRECTORIES:
+            journal.record_grilled(str(project.join(directory)), *EXPECTED_RESULT)
+
+    with Journal(str(project), resume=True) as journal:
+        result = rpmgrill.scan(str(project), journal=journal)
+
+    assert grill_calls == []
+    assert result == dict([EXPECTED_RESULT])
+
+def test_scan_distinct_rpm_sets(project, grill_calls):
+    project.join(DIRECTORIES[1], 'foo-1.0-1.fc24.x86_64.rpm').write('x86_64')
+
+    rpmgrill.scan(str(project))
+
+    assert [cmd[0] for cmd in grill_calls] == ['rpmgrill-unpack-rpms', 'rpmgrill'] * 2
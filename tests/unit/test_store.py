@@ -0,0 +1,42 @@
+"""Unit tests for the store module of the coprcheck package."""
+
+import pytest
+
+from coprcheck import store as strg
+
+
+# ### Fixtures ###
+@pytest.fixture
+def store(tmpdir):
+    """Empty artifact store."""
+    return strg.ArtifactStore(str(tmpdir))
+
+# ### Tests ###
+
+def test_store_add_new(store, tmpdir):
+    rpm = tmpdir.join('a', 'foo.rpm')
+    rpm.write('foo', ensure=True)
+
+    digest = store.add(str(rpm))
+    assert digest in store
+    assert rpm.samefile(store.path(digest))
+
+def test_store_add_duplicate(store, tmpdir):
+    first, second = tmpdir.join('a', 'foo.rpm'), tmpdir.join('b', 'foo.rpm')
+    first.write('foo', ensure=True)
+    second.write('foo', ensure=True)
+
+    assert store.add(str(first)) == store.add(str(second))
+    assert first.samefile(second)
+
+def test_store_link(store, tmpdir):
+    rpm = tmpdir.join('a', 'foo.rpm')
+    rpm.write('foo', ensure=True)
+    digest = store.add(str(rpm))
+
+    target = tmpdir.join('b', 'foo.rpm')
+    target.write('stale', ensure=True)
+    store.link(digest, str(target))
+
+    assert target.read() == 'foo'
+    assert target.samefile(rpm)